@@ -1,14 +1,25 @@
 import os
 from pathlib import Path
-from decouple import config
+from decouple import AutoConfig, Csv
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.utils import get_random_secret_key
 from datetime import timedelta
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-SECRET_KEY = config("SECRET_KEY", default=get_random_secret_key())
+# One config instance rooted at the project, so .env is located and parsed
+# once instead of being searched for from the caller's frame.
+config = AutoConfig(search_path=BASE_DIR)
+
 DEBUG = config("DEBUG", default=True, cast=bool)
 
+# Only fall back to a throwaway key in development; production must set one.
+SECRET_KEY = config("SECRET_KEY", default="")
+if not SECRET_KEY:
+    if not DEBUG:
+        raise ImproperlyConfigured("SECRET_KEY must be set when DEBUG is off.")
+    SECRET_KEY = get_random_secret_key()
+
 # ----- Hosts & CSRF -----
 IS_RENDER = 'RENDER' in os.environ
 if IS_RENDER:
@@ -43,11 +54,6 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "dj_rest_auth",
-    "dj_rest_auth.registration",   # <--- ADD THIS
-    "allauth",                     # <--- ADD THIS
-    "allauth.account",             # <--- ADD THIS
-    'allauth.socialaccount',
-    'rest_framework.authtoken',
     'django.contrib.sites',
     'corsheaders',
     "megamall.apps.MegamallConfig",
@@ -57,29 +63,32 @@ INSTALLED_APPS = [
 
 SITE_ID = 1
 
-ACCOUNT_USER_MODEL_USERNAME_FIELD = None
-ACCOUNT_USERNAME_REQUIRED = False
-ACCOUNT_EMAIL_REQUIRED = True
-ACCOUNT_AUTHENTICATION_METHOD = 'email'
-
 AUTH_USER_MODEL = "megamall.GuestUser"
 
-REST_AUTH_REGISTER_SERIALIZERS = {
-    'REGISTER_SERIALIZER': 'accounts.serializers.CustomRegisterSerializer',
+# dj-rest-auth is used for login/logout/password endpoints only; it issues
+# the same simplejwt tokens as /api/token/ instead of DRF auth tokens, so
+# dj-rest-auth/login/ returns {"access", "refresh", "user"}, not {"key"}.
+REST_AUTH = {
+    "USE_JWT": True,
+    "TOKEN_MODEL": None,
+    "JWT_AUTH_HTTPONLY": False,
 }
 
+# No CsrfViewMiddleware: DRF views are csrf_exempt and authenticate with
+# tokens, and the admin views are wrapped in csrf_protect, so the
+# middleware only added a token parse per request.
+# WhiteNoise goes first so static files are answered before any other
+# middleware (including the SSL redirect) runs.
 MIDDLEWARE = [
-    "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    "corsheaders.middleware.CorsMiddleware",    
+    "django.middleware.gzip.GZipMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "allauth.account.middleware.AccountMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "megamall.middleware.EarlyPatchMiddleware",
 ]
 
 ROOT_URLCONF = "backend.urls"
@@ -87,7 +96,7 @@ ROOT_URLCONF = "backend.urls"
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [os.path.join(BASE_DIR, 'templates')],
+        "DIRS": [BASE_DIR / 'templates'],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -100,53 +109,120 @@ TEMPLATES = [
     },
 ]
 
+# ----- Admin -----
+# The storefront only talks to the JWT API. Deployments that don't need the
+# Django admin can drop it, along with the messages framework and
+# clickjacking middleware that only the admin's HTML pages use.
+ADMIN_ENABLED = config("ADMIN_ENABLED", default=True, cast=bool)
+if not ADMIN_ENABLED:
+    INSTALLED_APPS.remove("django.contrib.admin")
+    INSTALLED_APPS.remove("django.contrib.messages")
+    MIDDLEWARE.remove("django.contrib.messages.middleware.MessageMiddleware")
+    MIDDLEWARE.remove("django.middleware.clickjacking.XFrameOptionsMiddleware")
+    TEMPLATES[0]["OPTIONS"]["context_processors"].remove("django.contrib.auth.context_processors.auth")
+    TEMPLATES[0]["OPTIONS"]["context_processors"].remove("django.contrib.messages.context_processors.messages")
+
 WSGI_APPLICATION = "backend.wsgi.application"
 
 CORS_ALLOWED_ORIGINS = [
     "https://masterpiece-frontend.vercel.app",
 ]
+# Let browsers cache preflight responses so repeat XHRs skip the OPTIONS trip.
+CORS_PREFLIGHT_MAX_AGE = 86400
 
+# A single backend: authenticate() tries each one in turn, so a second
+# backend only added another user lookup to every failed login.
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
-    "allauth.account.auth_backends.AuthenticationBackend",
+    "megamall.auth_backends.NoSignalModelBackend",
+]
+
+# Argon2 (C extension via argon2-cffi) for new hashes; the PBKDF2 hashers
+# stay so existing passwords still verify and are upgraded on next login.
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
 ]
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
     'megamall.authentication.MongoJWTAuthentication',
-    'rest_framework.authentication.SessionAuthentication',
-    'rest_framework.authentication.TokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'megamall.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'megamall.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': None,
 }
+if not DEBUG:
+    # The only client is the SPA frontend: no browsable API, OPTIONS
+    # introspection or ?format= suffix handling in production.
+    REST_FRAMEWORK.update({
+        'DEFAULT_RENDERER_CLASSES': ['megamall.renderers.ORJSONRenderer'],
+        'DEFAULT_METADATA_CLASS': None,
+        'URL_FORMAT_OVERRIDE': None,
+    })
 
 SIMPLE_JWT = {
-    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=240),
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=config("JWT_ACCESS_TOKEN_MINUTES", default=15, cast=int)),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': False,
     "USER_ID_FIELD": "id",
     "USER_ID_CLAIM": "user_id",
+    'ALGORITHM': 'HS256',
+    'SIGNING_KEY': SECRET_KEY,
+    'AUDIENCE': None,
+    'ISSUER': None,
 }
 
 # Database
 import django_mongodb_backend
+
+# A mongodb+srv:// URI is resolved through DNS (SRV + TXT) every time the
+# settings are loaded. Setting MONGO_URI to the expanded
+# mongodb://host1,host2,host3/?replicaSet=...&tls=true seed list skips
+# those lookups on boot and on every autoreload.
 MONGO_URI = config("MONGO_URI")
 MONGO_DB_NAME = config("MONGO_DB_NAME", default="Masterpiece")
+
+# PyMongo pool settings, passed straight through to MongoClient so each
+# worker keeps a warm pool instead of reconnecting on cold requests.
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": 100,
+    "minPoolSize": 10,
+    "maxIdleTimeMS": 60000,
+    "socketTimeoutMS": 20000,
+    "connectTimeoutMS": 5000,
+    "serverSelectionTimeoutMS": 3000,
+    "retryWrites": True,
+    # Compress the wire protocol with Atlas; needs pymongo[zstd,snappy]
+    "compressors": "zstd,snappy,zlib",
+    "zlibCompressionLevel": 6,
+}
+
 DATABASES = {
     "default": django_mongodb_backend.parse_uri(MONGO_URI, db_name=MONGO_DB_NAME)
 }
+DATABASES["default"].setdefault("OPTIONS", {}).update(MONGO_CLIENT_OPTIONS)
 
 # ----- Session & Cookies -----
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Only the admin uses sessions; keep them in the signed cookie instead of
+# paying a MongoDB read/write per request.
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
 SESSION_COOKIE_NAME = 'sessionid'
 SESSION_COOKIE_AGE = 1209600  # 2 weeks
-SESSION_SAVE_EVERY_REQUEST = True
+SESSION_SAVE_EVERY_REQUEST = False
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 SESSION_COOKIE_SECURE = not DEBUG
 CSRF_COOKIE_SECURE = not DEBUG
@@ -157,8 +233,18 @@ SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 # ----- Static -----
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
-if not DEBUG:
-    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    # collectstatic writes .gz and .br siblings that WhiteNoise serves as-is
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+WHITENOISE_USE_FINDERS = DEBUG
+WHITENOISE_AUTOREFRESH = DEBUG
+WHITENOISE_MAX_AGE = 31536000
 
 # ----- Default PK -----
 DEFAULT_AUTO_FIELD = "django_mongodb_backend.fields.ObjectIdAutoField"
@@ -170,12 +256,15 @@ CLOUDINARY_STORAGE = {
     'API_SECRET': config('CLOUDINARY_API_SECRET'),
 }
 
+# Folders upload_signature may sign direct uploads into (comma-separated)
+CLOUDINARY_SIGNED_UPLOAD_FOLDERS = config('CLOUDINARY_SIGNED_UPLOAD_FOLDERS', default='general', cast=Csv())
+
 # ✅ CLOUDINARY SDK CONFIGURATION (ADD AT THE BOTTOM)
 # Import and configure Cloudinary after all other settings are loaded
 try:
+    # Only the base package is needed to configure the SDK; uploader and
+    # api are imported where they are used.
     import cloudinary
-    import cloudinary.uploader
-    import cloudinary.api
     
     # Configure Cloudinary SDK
     cloudinary.config(
@@ -197,6 +286,31 @@ except ImportError:
 except Exception as e:
     print(f"Warning: Cloudinary configuration failed: {e}")
 
+# ----- Logging -----
+# Loggers hand records to a queue; megamall.log starts a listener thread per
+# process on first use that writes them to stderr.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "queue": {
+            "()": "megamall.log.queue_handler",
+        },
+    },
+    "loggers": {
+        "django": {
+            "handlers": ["queue"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "megamall": {
+            "handlers": ["queue"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
 # Security headers
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
@@ -208,5 +322,5 @@ if not DEBUG:
 
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
-USE_I18N = True
+USE_I18N = False
 USE_TZ = True
\ No newline at end of file
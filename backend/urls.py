@@ -1,10 +1,9 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, register_converter
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import RedirectView
 
-from rest_framework.authtoken.views import obtain_auth_token
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
 
@@ -23,9 +22,13 @@ from megamall.views import (
     create_courier_order,
     NoSignalLoginView,
     upload_image,
+    upload_signature,
     test_mongo_connection,
     kopokopo_callback,
 )
+from megamall.converters import ObjectIdConverter
+
+register_converter(ObjectIdConverter, 'objectid')
 
 # DRF Router (only for ViewSets)
 router = DefaultRouter()
@@ -43,21 +46,17 @@ api_urlpatterns = [
     # Authentication (JWT)
     path('token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    
-    # Add DRF token authentication endpoint
-    path('auth-token/', obtain_auth_token, name='api_token_auth'),
 
     # dj-rest-auth endpoints (NO extra api/ prefix here)
     path('dj-rest-auth/', include('dj_rest_auth.urls')),
-    path('dj-rest-auth/registration/', include('dj_rest_auth.registration.urls')),
 
     # User
     path('user-profile/', user_profile, name='user-profile'),
 
     # Orders
     path('orders/', create_order, name='create-order'),
-    path('orders/<str:order_id>/status/', get_order_status),
-    path('orders/<str:order_id>/invoice/', invoice_pdf_view, name='invoice-pdf'),
+    path('orders/<objectid:order_id>/status/', get_order_status),
+    path('orders/<objectid:order_id>/invoice/', invoice_pdf_view, name='invoice-pdf'),
 
     # M-Pesa
     path('payment/mpesa/initiate/', initiate_payment, name='initiate-payment'),
@@ -68,6 +67,7 @@ api_urlpatterns = [
 
     # Upload
     path('upload-image/', upload_image, name='upload_image'),
+    path('upload-signature/', upload_signature, name='upload_signature'),
 
     # Test Mongo
     path('test-mongo/', test_mongo_connection, name='test-mongo'),
@@ -77,10 +77,13 @@ urlpatterns = [
     # Redirect root to API base
     path('', RedirectView.as_view(url='/api/', permanent=False)),
 
-    # Custom Admin Login BEFORE default admin
-    path('admin/login/', NoSignalLoginView.as_view(), name='login'),
-    path('admin/', admin.site.urls),
-
     # API URLs
     path('api/', include(api_urlpatterns)),
 ]
+
+if settings.ADMIN_ENABLED:
+    urlpatterns += [
+        # Custom Admin Login BEFORE default admin
+        path('admin/login/', NoSignalLoginView.as_view(), name='login'),
+        path('admin/', admin.site.urls),
+    ]
@@ -1,13 +1,24 @@
 # Temporary patch for Python 3.13 (since cgi was removed)
 # Only implements what Django needs
+import re
 import urllib.parse as urlparse
+from functools import lru_cache
+
+# One `; name=value` parameter, value optionally quoted
+_PARAM_RE = re.compile(r';\s*([^=;]+?)\s*=\s*(?:"([^"]*)"|([^;]*?))\s*(?=;|$)')
+
+
+@lru_cache(maxsize=512)
+def _parse_header(line):
+    key, _, rest = line.partition(';')
+    params = tuple(
+        (m.group(1).lower(), m.group(2) if m.group(2) is not None else m.group(3))
+        for m in _PARAM_RE.finditer(';' + rest)
+    )
+    return key.strip().lower(), params
+
 
 def parse_header(line):
-    parts = line.split(';')
-    key = parts[0].strip().lower()
-    pdict = {}
-    for p in parts[1:]:
-        if '=' in p:
-            k, v = p.split('=', 1)
-            pdict[k.strip()] = v.strip().strip('"')
-    return key, pdict
+    key, params = _parse_header(line)
+    # Fresh dict per call so callers can't mutate the cached result
+    return key, dict(params)
@@ -1,10 +1,34 @@
 # megamall/admin.py
 from django.contrib import admin
 from .models import Product, Category, HireItem, GuestUser
-# Register your models here.
-admin.site.register(Product)
-admin.site.register(Category)
 
-admin.site.register(HireItem)
-admin.site.register(GuestUser)
 
+@admin.register(Product)
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ("name", "price", "category")
+    list_select_related = ("category",)
+    list_per_page = 50
+    search_fields = ("name",)
+    # A raw id input instead of a <select> filled with every category
+    raw_id_fields = ("category",)
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug")
+    list_per_page = 50
+    search_fields = ("name",)
+
+
+@admin.register(HireItem)
+class HireItemAdmin(admin.ModelAdmin):
+    list_display = ("name", "hire_price_per_day", "hire_price_per_hour")
+    list_per_page = 50
+    search_fields = ("name",)
+
+
+@admin.register(GuestUser)
+class GuestUserAdmin(admin.ModelAdmin):
+    list_display = ("email", "first_name", "last_name", "is_active", "is_staff")
+    list_per_page = 50
+    search_fields = ("email", "first_name", "last_name")
@@ -1,3 +1,4 @@
+from bson import ObjectId
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from django.contrib.auth import get_user_model
@@ -9,7 +10,15 @@ class MongoJWTAuthentication(JWTAuthentication):
         user_id = validated_token.get("user_id")
         if not user_id:
             raise AuthenticationFailed("Token contained no identifiable user", code="no_user_id")
+        user_id = str(user_id)
+        # GuestUser ids are ObjectId hex strings; reject anything else
+        # without a round trip to MongoDB
+        if not ObjectId.is_valid(user_id):
+            raise AuthenticationFailed("User not found", code="user_not_found")
         try:
-            return User.objects.get(id=str(user_id))  # always string
+            user = User.objects.get(id=user_id)  # always string
         except User.DoesNotExist:
             raise AuthenticationFailed("User not found", code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
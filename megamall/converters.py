@@ -0,0 +1,16 @@
+# megamall/converters.py
+from bson import ObjectId
+
+
+class ObjectIdConverter:
+    """
+    URL converter for 24-character hex ObjectIds.
+    Malformed ids fail URL resolution (404) instead of reaching the view.
+    """
+    regex = '[0-9a-fA-F]{24}'
+
+    def to_python(self, value):
+        return ObjectId(value)
+
+    def to_url(self, value):
+        return str(value)
@@ -0,0 +1,76 @@
+# megamall/log.py
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Records are enqueued by request threads and written out by a single
+# background listener, so a slow stderr never blocks a request.
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Threads don't survive fork(), so each process lazily builds its own queue
+# and listener the first time it logs (gunicorn --preload workers, the
+# runserver autoreloader child, ...).
+_lock = threading.Lock()
+_pid = None
+_queue = None
+_listener = None
+
+
+def _get_queue():
+    """
+    Return this process's log queue, starting its listener on first use.
+    """
+    global _pid, _queue, _listener
+    if _pid == os.getpid():
+        return _queue
+
+    with _lock:
+        if _pid != os.getpid():
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            _queue = queue.SimpleQueue()
+            _listener = QueueListener(_queue, handler, respect_handler_level=True)
+            _listener.start()
+            _pid = os.getpid()
+    return _queue
+
+
+def _reset_after_fork():
+    global _lock, _pid
+    # The parent's lock may have been held mid-fork
+    _lock = threading.Lock()
+    _pid = None
+
+
+def _stop_listener():
+    """
+    Flush and stop the listener, but only in the process that started it.
+    """
+    if _listener is not None and _pid == os.getpid():
+        _listener.stop()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(_stop_listener)
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues onto the current process's queue.
+    """
+
+    def __init__(self):
+        super().__init__(None)
+
+    def enqueue(self, record):
+        _get_queue().put_nowait(record)
+
+
+def queue_handler():
+    """
+    Handler factory referenced from settings.LOGGING.
+    """
+    return LazyQueueHandler()
@@ -1,13 +1,22 @@
 # models.py
 import uuid
-from cloudinary.models import CloudinaryField
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.text import slugify
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django_mongodb_backend.fields import ObjectIdAutoField
 from bson import ObjectId
 
 
+def generate_object_id():
+    """
+    Default for GuestUser.id: a fresh ObjectId as its 24-char hex string.
+    """
+    return str(ObjectId())
+
+
 class GuestUserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
         if not email:
@@ -31,7 +40,7 @@ class GuestUserManager(BaseUserManager):
 
 
 class GuestUser(AbstractBaseUser, PermissionsMixin):
-    id = models.CharField(primary_key=True, max_length=24, default=lambda: str(ObjectId()), editable=False)
+    id = models.CharField(primary_key=True, max_length=24, default=generate_object_id, editable=False)
     email = models.EmailField(unique=True)
     first_name = models.CharField(max_length=100, blank=True, null=True)  # ✅ added
     last_name = models.CharField(max_length=100, blank=True, null=True)
@@ -57,7 +66,9 @@ class Category(models.Model):
         verbose_name_plural = 'Categories'
 
     def save(self, *args, **kwargs):
-        if not self.slug:
+        update_fields = kwargs.get('update_fields')
+        # Partial saves that don't touch name can't need a new slug
+        if not self.slug and (update_fields is None or 'name' in update_fields):
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
 
@@ -65,6 +76,15 @@ class Category(models.Model):
         return self.name
 
 
+# CategoryView.list() caches its rows under this key
+CATEGORY_LIST_CACHE_KEY = "megamall:category-list"
+
+
+@receiver((post_save, post_delete), sender=Category, dispatch_uid="megamall_clear_category_list")
+def _clear_category_list(sender, **kwargs):
+    cache.delete(CATEGORY_LIST_CACHE_KEY)
+
+
 class Product(models.Model):
     name = models.CharField(max_length=255)
     price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -0,0 +1,48 @@
+# megamall/renderers.py
+from decimal import Decimal
+
+import orjson
+from bson import ObjectId
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj):
+    """
+    Fallback for types orjson doesn't serialize natively.
+    """
+    if isinstance(obj, (ObjectId, Decimal)):
+        # Decimals stay strings, like DRF's COERCE_DECIMAL_TO_STRING output
+        return str(obj)
+    # Everything else DRF's encoder knows: lazy translation strings,
+    # datetimes (ISO 8601 with "Z"), timedelta, sets, generators, ...
+    return _drf_encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson, which encodes straight to bytes.
+    Datetimes are passed through to DRF's encoder so their format matches
+    the stock JSONRenderer.
+    """
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=_default, option=self.options)
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser backed by orjson.
+    """
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -1,15 +1,10 @@
 # megamall/serializers.py
-from io import BytesIO
-from bson import ObjectId
+import copy
+from django_mongodb_backend.fields import ObjectIdAutoField
 from rest_framework import serializers
-from dj_rest_auth.registration.serializers import RegisterSerializer
-from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from django.contrib.auth.hashers import make_password
 from .models import Product, Category, GuestUser, ShippingAddress, Order, OrderItem, CourierOrder, HireItem
-import cloudinary.uploader
-from .fields import ObjectIdField
-from cloudinary.utils import cloudinary_url
 
 # ----------------------------
 # Base Serializer with ObjectId handling
@@ -17,27 +12,48 @@ from cloudinary.utils import cloudinary_url
 class BaseMongoDBSerializer(serializers.ModelSerializer):
     id = serializers.CharField(read_only=True)
 
+    # Names of model fields whose representation is an ObjectId: the pk and
+    # foreign keys to ObjectId pks. Worked out once per serializer class.
+    _objectid_fields = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        model = getattr(getattr(cls, 'Meta', None), 'model', None)
+        if model is None:
+            return
+        cls._objectid_fields = frozenset(
+            f.name for f in model._meta.concrete_fields
+            if isinstance(f, ObjectIdAutoField)
+            or (f.is_relation and isinstance(f.target_field, ObjectIdAutoField))
+        )
+
     def to_representation(self, instance):
+        # serializer.data is also used outside the JSON renderer (emails,
+        # json.dumps), so ObjectIds are stringified here
         rep = super().to_representation(instance)
-        for key, value in rep.items():
-            if isinstance(value, ObjectId):
+        for key in self._objectid_fields:
+            value = rep.get(key)
+            if value is not None:
                 rep[key] = str(value)
         return rep
 
-# ----------------------------
-# Base serializer with Cloudinary
-# ----------------------------
-# megamall/serializers.py
-
-class BaseMongoDBSerializer(serializers.ModelSerializer):
-    id = serializers.CharField(read_only=True)
+    def get_fields(self):
+        # ModelSerializer rebuilds every field from model introspection on
+        # each instantiation; build them once per class and hand out copies
+        cls = type(self)
+        fields = cls.__dict__.get('_cached_fields')
+        if fields is None:
+            fields = super().get_fields()
+            cls._cached_fields = fields
+        return copy.deepcopy(fields)
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        for key, value in rep.items():
-            if isinstance(value, ObjectId):
-                rep[key] = str(value)
-        return rep
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Add the select_related/prefetch_related calls this serializer's
+        nested fields need. Subclasses with relations override this.
+        """
+        return queryset
 
 # ----------------------------
 # SIMPLIFIED Base serializer - Just accepts image_url as string
@@ -63,7 +79,8 @@ class BaseCloudinarySerializer(BaseMongoDBSerializer):
         # Simply update the instance with the provided data
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        # Only write the fields that were sent
+        instance.save(update_fields=list(validated_data))
         return instance
 
 # ----------------------------
@@ -76,6 +93,11 @@ class ProductSerializer(BaseCloudinarySerializer):
         model = Product
         fields = ['id', 'name', 'price', 'description', 'category', 'category_name', 'image_url']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        # category_name reads product.category on every row
+        return queryset.select_related('category')
+
 # ----------------------------
 # HireItem Serializer
 # ----------------------------
@@ -137,18 +159,24 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
     def validate(self, attrs):
         data = super().validate(attrs)
+        user = self.user
         # also include user_id in the response body for convenience
-        data['user_id'] = str(self.user.pk)
-        data['email'] = self.user.email
+        data['user_id'] = user.pk  # GuestUser pk is already a hex string
+        data['email'] = user.email
         return data
     
 # ----------------------------
 # Order Item Serializer
 # ----------------------------
 class OrderItemSerializer(BaseMongoDBSerializer):
-    id = serializers.CharField(read_only=True)
-    product = serializers.StringRelatedField()
-    product_image_url = serializers.ReadOnlyField(source='product.image_url')
+    """
+    Both product fields dereference item.product: serialize items fetched
+    with select_related('product') (OrderSerializer.setup_eager_loading
+    does this for nested items).
+    """
+    # Product.__str__ is its name; reading it directly skips str() dispatch
+    product = serializers.CharField(source='product.name', read_only=True, allow_null=True)
+    product_image_url = serializers.ReadOnlyField(source='product.image_url', allow_null=True)
 
     class Meta:
         model = OrderItem
@@ -158,7 +186,11 @@ class OrderItemSerializer(BaseMongoDBSerializer):
 # Order Serializer
 # ----------------------------
 class OrderSerializer(BaseMongoDBSerializer):
-    id = serializers.CharField(read_only=True)
+    """
+    Nests the user, address, items and each item's product.
+    Pass querysets through setup_eager_loading() before serializing, or
+    every order costs a query per relation and per item.
+    """
     guest_user = GuestUserSerializer(read_only=True)
     shipping_address = ShippingAddressSerializer(read_only=True)
     order_items = OrderItemSerializer(many=True, read_only=True)
@@ -170,13 +202,20 @@ class OrderSerializer(BaseMongoDBSerializer):
             'total_price', 'status', 'created_at', 'order_items'
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related('guest_user', 'shipping_address').prefetch_related(
+            Prefetch('order_items', queryset=OrderItem.objects.select_related('product'))
+        )
+
 # ----------------------------
 # Courier Order Serializer
 # ----------------------------
+_PARCEL_CHOICES = (("send", "send"), ("receive", "receive"))
+
 class CourierOrderSerializer(BaseMongoDBSerializer):
-    id = serializers.CharField(read_only=True)
     parcel_action = serializers.ChoiceField(
-        choices=[("send", "send"), ("receive", "receive")],
+        choices=_PARCEL_CHOICES,
         required=False,
         allow_blank=True
     )
@@ -188,33 +227,17 @@ class CourierOrderSerializer(BaseMongoDBSerializer):
 
     class Meta:
         model = CourierOrder
-        fields = '__all__'
+        fields = [
+            'id', 'parcel_action', 'from_address', 'to_address',
+            'selected_item', 'item_price', 'item_type', 'order_type',
+            'delivery_fee', 'total', 'payment_method',
+            'contact_name', 'contact_phone', 'notes',
+            'recipient_name', 'recipient_phone', 'delivery_location',
+            'created_at'
+        ]
 
     def validate(self, data):
-        if 'parcel_action' in data:
-            data['order_type'] = data['parcel_action']
+        parcel_action = data.get('parcel_action')
+        if parcel_action is not None:
+            data['order_type'] = parcel_action
         return data
-    
-class CustomRegisterSerializer(RegisterSerializer):
-    username = None  # removes username completely
-    first_name = serializers.CharField(required=False, allow_blank=True)
-    last_name = serializers.CharField(required=False, allow_blank=True)
-    phone = serializers.CharField(required=False, allow_blank=True)
-
-    def get_cleaned_data(self):
-        return {
-            'email': self.validated_data.get('email', ''),
-            'password1': self.validated_data.get('password1', ''),
-            'password2': self.validated_data.get('password2', ''),
-            'first_name': self.validated_data.get('first_name', ''),
-            'last_name': self.validated_data.get('last_name', ''),
-            'phone': self.validated_data.get('phone', ''),
-        }
-
-    def save(self, request):
-        user = super().save(request)
-        user.first_name = self.cleaned_data.get('first_name')
-        user.last_name = self.cleaned_data.get('last_name')
-        user.phone = self.cleaned_data.get('phone')
-        user.save()
-        return user
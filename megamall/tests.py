@@ -1,3 +1,265 @@
-from django.test import TestCase
+import datetime
+import logging
+import sys
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+import orjson
+from bson import ObjectId
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models.signals import post_save
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from megamall import log
+from megamall.authentication import MongoJWTAuthentication
+from megamall.models import CATEGORY_LIST_CACHE_KEY, Category, GuestUser, Order, OrderItem, Product
+from megamall.renderers import ORJSONRenderer
+from megamall.utils import downscale_image
+from megamall.serializers import OrderItemSerializer, ProductSerializer
+from megamall.views import CategoryView, upload_image, upload_signature
+from PIL import Image
+
+
+class MongoJWTAuthenticationTests(SimpleTestCase):
+    def setUp(self):
+        self.user = GuestUser(id=str(ObjectId()), email="guest@example.com")
+        self.token = {"user_id": self.user.id}
+        patcher = mock.patch.object(GuestUser.objects, "get", return_value=self.user)
+        self.get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def authenticate(self):
+        return MongoJWTAuthentication().get_user(self.token)
+
+    def test_active_user_is_returned(self):
+        self.assertIs(self.authenticate(), self.user)
+        self.get.assert_called_once_with(id=self.user.id)
+
+    def test_inactive_user_is_rejected(self):
+        self.user.is_active = False
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_malformed_user_id_skips_lookup(self):
+        with self.assertRaises(AuthenticationFailed):
+            MongoJWTAuthentication().get_user({"user_id": "not-an-object-id"})
+        self.get.assert_not_called()
+
+class ORJSONRendererTests(SimpleTestCase):
+    def render(self, data):
+        return orjson.loads(ORJSONRenderer().render(data))
+
+    def test_lazy_translation_string(self):
+        self.assertEqual(self.render({"detail": gettext_lazy("Successfully logged out.")}),
+                         {"detail": "Successfully logged out."})
+
+    def test_object_id_and_decimal_are_strings(self):
+        oid = ObjectId()
+        self.assertEqual(self.render({"id": oid, "price": Decimal("12.50")}),
+                         {"id": str(oid), "price": "12.50"})
+
+    def test_datetime_matches_drf_format(self):
+        moment = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+        self.assertEqual(self.render({"at": moment}), {"at": "2024-01-02T03:04:05Z"})
+
+    def test_set_and_timedelta(self):
+        rendered = self.render({"tags": {"a"}, "ttl": datetime.timedelta(seconds=90)})
+        self.assertEqual(rendered, {"tags": ["a"], "ttl": "90.0"})
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_logout_view_renders(self):
+        from dj_rest_auth.views import LogoutView
+
+        request = APIRequestFactory().post("/api/auth/logout/")
+        request.session = SessionStore()
+        force_authenticate(request, user=AnonymousUser())
+        response = LogoutView.as_view()(request)
+        response.accepted_renderer = ORJSONRenderer()
+        response.accepted_media_type = "application/json"
+        response.renderer_context = {}
+        response.render()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(orjson.loads(response.content), {"detail": str(response.data["detail"])})
+
+
+class UploadImageTests(SimpleTestCase):
+    def post(self, upload):
+        request = APIRequestFactory().post("/upload-image/", {"image": upload}, format="multipart")
+        force_authenticate(request, user=GuestUser(id=str(ObjectId())))
+        return upload_image(request)
+
+    def png(self, size):
+        buf = BytesIO()
+        Image.new("RGB", size).save(buf, format="PNG")
+        return SimpleUploadedFile("photo.png", buf.getvalue(), content_type="image/png")
+
+    def test_non_image_is_rejected(self):
+        response = self.post(SimpleUploadedFile("notes.png", b"not an image", content_type="image/png"))
+        self.assertEqual(response.status_code, 400)
+
+    def test_decompression_bomb_is_rejected(self):
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 10):
+            response = self.post(self.png((10, 10)))
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(CLOUDINARY_SIGNED_UPLOAD_FOLDERS=["general", "products"])
+class UploadSignatureTests(SimpleTestCase):
+    def post(self, data, is_staff=True):
+        request = APIRequestFactory().post("/upload-signature/", data, format="json")
+        force_authenticate(request, user=GuestUser(id=str(ObjectId()), is_staff=is_staff))
+        return upload_signature(request)
+
+    def test_allowed_folder_is_signed(self):
+        response = self.post({"folder": "products"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["folder"], "products")
+        self.assertIn("signature", response.data)
+
+    def test_unknown_folder_is_rejected(self):
+        response = self.post({"folder": "anything/else"})
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("signature", response.data)
+
+    def test_customer_is_rejected(self):
+        response = self.post({"folder": "products"}, is_staff=False)
+        self.assertEqual(response.status_code, 403)
+
+    def test_anonymous_request_is_rejected(self):
+        request = APIRequestFactory().post("/upload-signature/", {}, format="json")
+        self.assertEqual(upload_signature(request).status_code, 401)
+
+
+class OrderItemSerializerTests(SimpleTestCase):
+    def setUp(self):
+        product = Product(id=ObjectId(), name="Lamp", price=Decimal("12.50"), image_url="https://example.com/lamp.jpg")
+        self.item = OrderItem(id=ObjectId(), order=Order(id=ObjectId()), product=product, quantity=2, price=Decimal("12.50"))
+
+    def test_representation(self):
+        self.assertEqual(OrderItemSerializer(self.item).data, {
+            "id": str(self.item.id),
+            "product": "Lamp",
+            "product_image_url": "https://example.com/lamp.jpg",
+            "quantity": 2,
+            "price": "12.50",
+        })
+
+    def test_missing_product_renders_null(self):
+        item = OrderItem(id=ObjectId(), order=Order(id=ObjectId()), product_id=ObjectId(), quantity=1, price=Decimal("3"))
+        descriptor = type(OrderItem.__dict__["product"])
+        with mock.patch.object(descriptor, "get_object", side_effect=Product.DoesNotExist):
+            data = OrderItemSerializer([item], many=True).data
+        self.assertEqual(data[0]["product"], None)
+        self.assertEqual(data[0]["product_image_url"], None)
+
+
+class BaseMongoDBSerializerTests(SimpleTestCase):
+    def test_foreign_keys_are_strings(self):
+        category = Category(id=ObjectId(), name="Lighting")
+        product = Product(id=ObjectId(), name="Lamp", price=Decimal("12.50"), category=category)
+        data = ProductSerializer(product).data
+        self.assertEqual(data["category"], str(category.id))
+        self.assertEqual(data["id"], str(product.id))
+
+
+class CategoryListCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category(id=ObjectId(), name="Lighting", slug="lighting")
+        # Querysets are lazy; iterating the rows is what hits MongoDB
+        self.rows = mock.MagicMock()
+        self.rows.__iter__.side_effect = lambda: iter([{"id": self.category.id, "name": "Lighting", "slug": "lighting"}])
+        queryset = mock.MagicMock()
+        queryset.values.return_value = self.rows
+        patcher = mock.patch.object(CategoryView, "get_queryset", return_value=queryset)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def list(self):
+        request = APIRequestFactory().get("/categories/", HTTP_ACCEPT="application/json")
+        return CategoryView.as_view({"get": "list"})(request)
+
+    def test_rows_are_cached_with_string_ids(self):
+        self.assertEqual(self.list().data, [{"id": str(self.category.id), "name": "Lighting", "slug": "lighting"}])
+        self.list()
+        self.assertEqual(self.rows.__iter__.call_count, 1)
+
+    def test_save_clears_cached_rows(self):
+        self.list()
+        post_save.send(sender=Category, instance=self.category, created=False)
+        self.assertIsNone(cache.get(CATEGORY_LIST_CACHE_KEY))
+        self.list()
+        self.assertEqual(self.rows.__iter__.call_count, 2)
+
+
+class DownscaleImageTests(SimpleTestCase):
+    def encode(self, frames, fmt, **kwargs):
+        buf = BytesIO()
+        frames[0].save(buf, format=fmt, **kwargs)
+        buf.seek(0)
+        return buf
+
+    def test_large_image_is_downscaled(self):
+        result = downscale_image(self.encode([Image.new("RGB", (2048, 512))], "PNG"), max_edge=1024)
+        self.assertEqual(Image.open(result).size, (1024, 256))
+
+    def test_animated_image_is_returned_as_is(self):
+        frames = [Image.new("RGB", (2048, 16), color) for color in ("red", "blue")]
+        original = self.encode(frames, "GIF", save_all=True, append_images=frames[1:])
+        self.assertIs(downscale_image(original, max_edge=1024), original)
+        self.assertEqual(original.tell(), 0)
+
+    def test_unwritable_format_is_returned_as_is(self):
+        original = self.encode([Image.new("RGB", (2048, 512))], "PNG")
+        # Stand-in for formats Pillow reads but can't write, such as PSD
+        with mock.patch.dict(Image.SAVE, clear=True):
+            self.assertIs(downscale_image(original, max_edge=1024), original)
+        self.assertEqual(original.tell(), 0)
+
+
+class QueueLoggingTests(SimpleTestCase):
+    def setUp(self):
+        # Start from a process with no listener, writing to a captured stderr
+        self.stream = StringIO()
+        for patcher in (
+            mock.patch.object(log, "_pid", None),
+            mock.patch.object(log, "_queue", None),
+            mock.patch.object(log, "_listener", None),
+            mock.patch.object(sys, "stderr", self.stream),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_records_reach_the_stream_and_flush_on_stop(self):
+        logger = logging.getLogger("megamall.tests.queue")
+        handler = log.queue_handler()
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+
+        logger.warning("order %s paid", "abc123")
+        self.assertIsNotNone(log._listener)
+        log._stop_listener()
+
+        self.assertIn("WARNING megamall.tests.queue: order abc123 paid", self.stream.getvalue())
+
+    def test_listener_is_restarted_in_a_new_process(self):
+        log.queue_handler().handle(logging.makeLogRecord({"msg": "parent"}))
+        parent_listener = log._listener
+        self.addCleanup(parent_listener.stop)
+
+        # What a forked child sees: inherited state with a different pid
+        with mock.patch.object(log.os, "getpid", return_value=-1):
+            log.queue_handler().handle(logging.makeLogRecord({"msg": "child"}))
+            child_listener = log._listener
+            log._stop_listener()
+
+        self.assertIsNot(child_listener, parent_listener)
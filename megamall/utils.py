@@ -5,8 +5,8 @@ from xhtml2pdf import pisa
 from django.core.mail import EmailMessage
 from django.conf import settings
 from django.utils.html import strip_tags
+from PIL import Image, ImageOps, UnidentifiedImageError
 
-import cloudinary.uploader
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,43 @@ def generate_invoice_pdf(context):
         logger.error(f"PDF generation failed: {str(e)}")
     return None
 
+# ----------------------------
+# Image Upload Utility
+# ----------------------------
+def downscale_image(fileobj, max_edge=1024):
+    """
+    Shrink an uploaded image so its longest edge is at most max_edge pixels.
+    Returns a file-like object in the original format; files that are
+    already small enough, animated, or can't be re-encoded are returned
+    as-is. Raises UnidentifiedImageError
+    for non-images and Image.DecompressionBombError for oversized ones.
+    """
+    try:
+        img = Image.open(fileobj)
+        # Animated GIF/WebP would be flattened to their first frame
+        if max(img.size) <= max_edge or getattr(img, 'is_animated', False):
+            fileobj.seek(0)
+            return fileobj
+        img_format = img.format or 'JPEG'
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+        buf = BytesIO()
+        if img_format == 'JPEG':
+            img.convert('RGB').save(buf, format=img_format, quality=85, optimize=True)
+        else:
+            img.save(buf, format=img_format)
+    except UnidentifiedImageError:
+        raise
+    except (OSError, KeyError, ValueError):
+        # Damaged files (e.g. truncated) and formats Pillow can read but
+        # not write (e.g. PSD): let Cloudinary have the original
+        fileobj.seek(0)
+        return fileobj
+
+    buf.seek(0)
+    return buf
+
 # ----------------------------
 # Email Sending Utility
 # ----------------------------
@@ -7,6 +7,7 @@ import os
 import json
 import traceback
 import ssl
+import time
 import urllib.request
 from datetime import datetime, timedelta
 from io import BytesIO
@@ -23,6 +24,7 @@ from django.shortcuts import get_object_or_404, redirect
 from django.template.loader import get_template
 from django.urls import reverse
 from django.utils.html import strip_tags
+from django.core.cache import cache
 from rest_framework.parsers import MultiPartParser, FormParser
 from bson import ObjectId
 from django.http import Http404
@@ -33,9 +35,6 @@ from django.views.decorators.csrf import csrf_exempt
 from k2connect import k2connect
 from pymongo import MongoClient
 import certifi
-import cloudinary
-import cloudinary.api
-import cloudinary.uploader
 import requests
 import sendgrid
 from decouple import config
@@ -44,7 +43,7 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.parsers import JSONParser
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -59,6 +58,7 @@ from sendgrid.helpers.mail import (
     Disposition,
 )
 from xhtml2pdf import pisa
+from PIL import Image, UnidentifiedImageError
 
 # Project-local imports
 from megamall.models import (
@@ -70,6 +70,7 @@ from megamall.models import (
     OrderItem,
     HireItem,
     CourierOrder,
+    CATEGORY_LIST_CACHE_KEY,
 )
 from megamall.serializers import (
     ProductSerializer,
@@ -81,6 +82,7 @@ from megamall.serializers import (
     HireItemSerializer,
     CourierOrderSerializer,
 )
+from megamall.utils import downscale_image
 CLIENT_ID = os.getenv("KOPOKOPO_CLIENT_ID")
 CLIENT_SECRET = os.getenv("KOPOKOPO_CLIENT_SECRET")
 BASE_URL = os.getenv("KOPOKOPO_BASE_URL", "https://api.kopokopo.com")  # sandbox/live
@@ -151,22 +153,25 @@ def upload_image(request):
         if not image_file:
             return Response({"error": "No image provided"}, status=status.HTTP_400_BAD_REQUEST)
         
-        print("**** Uploading Image ****")
-        print("Folder:", folder)
-        print("File:", image_file.name)
-        
-        # ✅ EXACT APPROACH FROM CLOUDINARY DOCUMENTATION
-        # Read the file content into memory
-        file_content = image_file.read()
+        # Large photos are downscaled before they go over the wire
+        try:
+            image = downscale_image(image_file)
+        except (UnidentifiedImageError, Image.DecompressionBombError):
+            return Response({"error": "Invalid or oversized image"}, status=status.HTTP_400_BAD_REQUEST)
         
         # Generate a unique public_id like your examples
         import uuid
         unique_id = uuid.uuid4().hex[:20]  # 20 char unique ID like "thufhhtaxymd5v1fzyan"
         public_id = f"{unique_id}"
         
-        # Upload the image using the exact same parameters as documentation
-        result = cloudinary.uploader.upload(
-            file_content,
+        # Imported here so the uploader isn't loaded at startup
+        from cloudinary.uploader import upload_large
+
+        # Sent in 6 MB chunks read from the file object, so the whole
+        # image never has to sit in one request body
+        result = upload_large(
+            image,
+            chunk_size=6_000_000,
             public_id=public_id,
             folder=folder,
             unique_filename=False,  # Use our custom public_id
@@ -174,11 +179,6 @@ def upload_image(request):
             resource_type="image"
         )
         
-        print("**** Upload Successful ****")
-        print("URL:", result['secure_url'])
-        print("Public ID:", result['public_id'])
-        print("Format:", result['format'])
-        
         # The URL should now be exactly like:
         # https://res.cloudinary.com/masterpieceempire/image/upload/v1757574283/thufhhtaxymd5v1fzyan.jpg
         
@@ -190,10 +190,38 @@ def upload_image(request):
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
-        logger.error(f"Image upload error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Image upload error")
         return Response({"error": f"Failed to upload image: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def upload_signature(request):
+    """
+    Sign a direct browser-to-Cloudinary upload, so the file goes straight
+    to https://api.cloudinary.com/v1_1/<cloud_name>/image/upload and only
+    the resulting secure_url is posted back to this API. Staff only, and
+    only into settings.CLOUDINARY_SIGNED_UPLOAD_FOLDERS
+    """
+    import cloudinary
+    from cloudinary.utils import api_sign_request
+
+    folder = request.data.get('folder', 'general')
+    if folder not in settings.CLOUDINARY_SIGNED_UPLOAD_FOLDERS:
+        return Response({"error": "Invalid upload folder"}, status=status.HTTP_400_BAD_REQUEST)
+
+    cfg = cloudinary.config()
+    params = {
+        "timestamp": int(time.time()),
+        "folder": folder,
+    }
+    return Response({
+        **params,
+        "signature": api_sign_request(params, cfg.api_secret),
+        "api_key": cfg.api_key,
+        "cloud_name": cfg.cloud_name,
+    }, status=status.HTTP_200_OK)
+
         
 def cloudinary_debug(request):
     from cloudinary_storage.storage import MediaCloudinaryStorage
@@ -216,7 +244,7 @@ class NoSignalLoginView(LoginView):
     def form_valid(self, form):
         user = form.get_user()
         # Log the user in WITHOUT triggering the last_login update
-        login(self.request, user, backend='django.contrib.auth.backends.ModelBackend')
+        login(self.request, user, backend='megamall.auth_backends.NoSignalModelBackend')
         return redirect("/admin/")  # ✅ force redirect to admin dashboard
 
 
@@ -228,7 +256,7 @@ class ProductView(viewsets.ModelViewSet):
 
     def get_queryset(self):
         category_slug = self.request.query_params.get("category")
-        queryset = Product.objects.all()
+        queryset = ProductSerializer.setup_eager_loading(Product.objects.all())
         if category_slug:
             queryset = queryset.filter(category__slug=category_slug)
         return queryset.order_by('-id')
@@ -252,6 +280,26 @@ class CategoryView(viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
+    # Short enough to bound staleness on other workers: the default cache is
+    # per process, so a write only clears the worker that handled it
+    list_cache_timeout = 60
+
+    def list(self, request, *args, **kwargs):
+        # Plain dicts straight from the DB instead of a serializer per row;
+        # same keys as CategorySerializer
+        queryset = self.filter_queryset(self.get_queryset()).values('id', 'name', 'slug')
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response([{**row, 'id': str(row['id'])} for row in page])
+
+        # The rows are cached rather than the response, so the renderer is
+        # still picked per request
+        rows = cache.get(CATEGORY_LIST_CACHE_KEY)
+        if rows is None:
+            rows = [{**row, 'id': str(row['id'])} for row in queryset]
+            cache.set(CATEGORY_LIST_CACHE_KEY, rows, self.list_cache_timeout)
+        return Response(rows)
+
 
 class GuestUserViewSet(viewsets.ModelViewSet):
     queryset = GuestUser.objects.all()
@@ -446,14 +494,8 @@ def create_order(request):
 @permission_classes([AllowAny])
 def get_order_status(request, order_id):
     try:
-        # Handle both ObjectId and string representations
-        try:
-            # First try as ObjectId
-            order_obj_id = ObjectId(order_id)
-            order = Order.objects.get(id=order_obj_id)
-        except:
-            # If that fails, try as string
-            order = Order.objects.get(id=order_id)
+        # order_id is already an ObjectId (see ObjectIdConverter)
+        order = OrderSerializer.setup_eager_loading(Order.objects.all()).get(id=order_id)
 
         serializer = OrderSerializer(order)
         return Response(serializer.data)
@@ -477,7 +519,7 @@ def render_to_pdf(template_src, context_dict={}):
 
 
 def invoice_pdf_view(request, order_id):
-    order = get_object_or_404(Order, id=order_id)
+    order = get_object_or_404(OrderSerializer.setup_eager_loading(Order.objects.all()), id=order_id)
     context = {
         "invoice_number": order.id,
         "items": order.order_items.all(),